@@ -3,19 +3,250 @@ Command-line interface for indxr
 """
 
 import click
+import functools
+import multiprocessing as mp
+import os
 import sys
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional
 
 try:
     import tomllib
 except ImportError:
     import tomli as tomllib
 
-from .parser import IndexParser
+from .parser import IndexParser, SlideEntry, count_slides
 from .generators import BookPDFGenerator, MasterIndexGenerator, CompactIndexGenerator
 
 
+@functools.lru_cache(maxsize=8)
+def _load_config(path_str: str) -> dict:
+    """Load and cache a TOML config file (callers must not mutate the result)"""
+    with open(path_str, 'rb') as f:
+        return tomllib.load(f)
+
+
+def _apply(config_data: dict, **values) -> dict:
+    """Return values with any matching keys overridden by config_data"""
+    return {key: config_data.get(key, value) for key, value in values.items()}
+
+
+def _process_pool(max_workers: int) -> ProcessPoolExecutor:
+    """
+    Create a process pool for rendering PDFs
+
+    Uses the 'spawn' start method so behaviour matches across Linux, macOS
+    and Windows.
+    """
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=mp.get_context('spawn')
+    )
+
+
+def _render_book(
+    book_num: int,
+    entries: List[SlideEntry],
+    output_dir: str,
+    title_prefix: Optional[str]
+) -> str:
+    """Render a single book PDF (module-level so worker processes can run it)"""
+    generator = BookPDFGenerator(
+        book_num,
+        entries,
+        output_dir,
+        title_prefix=title_prefix
+    )
+    return generator.generate()
+
+
+def _wait_for(pending: Dict[Future, str]):
+    """Wait for submitted renders, reporting each output file as it completes"""
+    for future in as_completed(pending):
+        click.echo(f"  [OK] Created: {future.result()} {pending[future]}")
+
+
+def _shallow_glob(index_dir: Path, pattern: str) -> List[Path]:
+    """
+    Find files in index_dir matching pattern, sorted by path
+
+    Patterns with a single '*' wildcard and no directory component (such as
+    the default 'Book * Index.md') are matched with one directory scan and a
+    prefix/suffix check. Anything else falls back to Path.glob.
+    """
+    if (
+        pattern.count('*') == 1
+        and not any(c in pattern for c in '?[{/')
+        and os.sep not in pattern
+    ):
+        # normcase makes the match case-insensitive on Windows, as Path.glob is
+        prefix, suffix = os.path.normcase(pattern).split('*')
+        matches = []
+        with os.scandir(index_dir) as it:
+            for entry in it:
+                name = os.path.normcase(entry.name)
+                # Check the name first; DirEntry.is_file() then answers from
+                # the d_type returned by readdir without another stat() call,
+                # except for symlinks, which are still followed so linked
+                # index files keep working
+                if (
+                    len(name) >= len(prefix) + len(suffix)
+                    and name.startswith(prefix)
+                    and name.endswith(suffix)
+                    and entry.is_file()
+                ):
+                    matches.append(entry.name)
+        # Every match lives in index_dir, so sorting by name is enough; normcase
+        # gives the same order as sorting the paths themselves
+        return [index_dir / name for name in sorted(matches, key=os.path.normcase)]
+
+    return sorted(index_dir.glob(pattern))
+
+
+def _load_entries(
+    index_dir: Path,
+    file_pattern: str,
+    pattern: Optional[str]
+) -> Dict[int, List[SlideEntry]]:
+    """Find and parse index files, exiting with an error if none are found"""
+    if not index_dir.exists():
+        click.echo(f"Error: Index directory '{index_dir}' does not exist.", err=True)
+        sys.exit(1)
+
+    # Find index files
+    index_files = _shallow_glob(index_dir, file_pattern)
+
+    if not index_files:
+        click.echo(f"No index files found in {index_dir} matching '{file_pattern}'", err=True)
+        sys.exit(1)
+
+    click.echo(f"Found {len(index_files)} index file(s)\n")
+
+    # Parse all index files
+    click.echo("Parsing index files...")
+    return IndexParser.parse_multiple(index_files, pattern, max_workers=os.cpu_count() or 1)
+
+
+def _run_books(
+    all_entries: Dict[int, List[SlideEntry]],
+    output_dir: Path,
+    title_prefix: Optional[str],
+    executor: Optional[ProcessPoolExecutor] = None
+) -> Dict[Future, str]:
+    """
+    Generate per-book content PDFs
+
+    Each book is an independent PDF, so if executor is given every book is
+    queued on it at once and the pending futures are returned for
+    _wait_for(). Otherwise the books are rendered here, one after another.
+    """
+    if not all_entries:
+        click.echo("No entries parsed from index files", err=True)
+        sys.exit(1)
+
+    # Generate PDF for each book
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    pending = {}
+    for book_num, entries in sorted(all_entries.items()):
+        click.echo(f"Generating PDF for Book {book_num}...")
+        if executor is None:
+            output_file = _render_book(book_num, entries, str(output_dir), title_prefix)
+            click.echo(f"  [OK] Created: {output_file} ({len(entries)} slides)\n")
+            continue
+
+        future = executor.submit(
+            _render_book, book_num, entries, str(output_dir), title_prefix
+        )
+        pending[future] = f"({len(entries)} slides)"
+
+    return pending
+
+
+def _run_master(
+    all_entries: Dict[int, List[SlideEntry]],
+    output_dir: Path,
+    title: Optional[str],
+    subtitle: Optional[str],
+    top_tags: int,
+    executor: Optional[ProcessPoolExecutor] = None
+) -> Dict[Future, str]:
+    """
+    Generate the master index PDF from already-parsed entries
+
+    If executor is given, rendering is queued on it and the pending future
+    is returned instead of waiting for the PDF.
+    """
+    click.echo(f"Parsed {count_slides(all_entries)} total slides\n")
+
+    # Generate master index
+    click.echo("Generating master index PDF...")
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    generator = MasterIndexGenerator(
+        all_entries,
+        str(output_dir),
+        title=title,
+        subtitle=subtitle
+    )
+
+    # Show statistics
+    stats = generator.get_statistics()
+    click.echo(f"\nStatistics:")
+    click.echo(f"  Total Books: {stats['total_books']}")
+    click.echo(f"  Total Slides: {stats['total_slides']}")
+    click.echo(f"  Unique Tags: {stats['total_tags']}")
+
+    click.echo(f"\nTop {top_tags} Most Common Tags:")
+    for tag_info in stats['top_tags'][:top_tags]:
+        tag = tag_info['tag'][1:] if tag_info['tag'].startswith('#') else tag_info['tag']
+        click.echo(f"  {tag}: {tag_info['count']} occurrences across {tag_info['books']} book(s)")
+
+    if executor is not None:
+        return {executor.submit(generator.generate): "(master index)"}
+
+    output_file = generator.generate()
+    click.echo(f"\n[OK] Master index created: {output_file}")
+    return {}
+
+
+def _run_compact(
+    all_entries: Dict[int, List[SlideEntry]],
+    output_dir: Path,
+    title: Optional[str],
+    executor: Optional[ProcessPoolExecutor] = None
+) -> Dict[Future, str]:
+    """
+    Generate the compact index PDF from already-parsed entries
+
+    If executor is given, rendering is queued on it and the pending future
+    is returned instead of waiting for the PDF.
+    """
+    click.echo(f"Parsed {count_slides(all_entries)} total slides\n")
+
+    # Generate compact index
+    click.echo("Generating compact two-column index PDF...")
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    generator = CompactIndexGenerator(all_entries, str(output_dir), title=title)
+
+    # Show statistics
+    stats = generator.get_statistics()
+    click.echo(f"\nStatistics:")
+    click.echo(f"  Total Books: {stats['total_books']}")
+    click.echo(f"  Total Slides: {stats['total_slides']}")
+    click.echo(f"  Unique Tags: {stats['total_tags']}")
+
+    if executor is not None:
+        return {executor.submit(generator.generate): "(compact index)"}
+
+    output_file = generator.generate()
+    click.echo(f"\n[OK] Compact index created: {output_file}")
+    click.echo(f"Format: Two columns per page with B#:P# notation")
+    return {}
+
+
 @click.group()
 @click.version_option()
 def main():
@@ -67,49 +298,30 @@ def books(
 ):
     """Generate per-book content PDFs"""
 
-    # Load config if provided
-    if config:
-        with open(config, 'rb') as f:
-            config_data = tomllib.load(f)
-        index_dir = Path(config_data.get('index_dir', index_dir))
-        output_dir = Path(config_data.get('output_dir', output_dir))
-        pattern = config_data.get('pattern', pattern)
-        file_pattern = config_data.get('file_pattern', file_pattern)
-        title_prefix = config_data.get('title_prefix', title_prefix)
-
-    if not index_dir.exists():
-        click.echo(f"Error: Index directory '{index_dir}' does not exist.", err=True)
-        sys.exit(1)
-
-    # Find index files
-    index_files = sorted(index_dir.glob(file_pattern))
-
-    if not index_files:
-        click.echo(f"No index files found in {index_dir} matching '{file_pattern}'", err=True)
-        sys.exit(1)
-
-    click.echo(f"Found {len(index_files)} index file(s)\n")
-
-    # Parse all index files
-    all_entries = IndexParser.parse_multiple([str(f) for f in index_files], pattern)
-
-    if not all_entries:
-        click.echo("No entries parsed from index files", err=True)
-        sys.exit(1)
+    # Config file values take precedence over command-line options
+    cfg = _apply(
+        _load_config(str(config)) if config else {},
+        index_dir=index_dir,
+        output_dir=output_dir,
+        pattern=pattern,
+        file_pattern=file_pattern,
+        title_prefix=title_prefix
+    )
 
-    # Generate PDF for each book
-    output_dir.mkdir(parents=True, exist_ok=True)
-
-    for book_num, entries in sorted(all_entries.items()):
-        click.echo(f"Generating PDF for Book {book_num}...")
-        generator = BookPDFGenerator(
-            book_num,
-            entries,
-            str(output_dir),
-            title_prefix=title_prefix
-        )
-        output_file = generator.generate()
-        click.echo(f"  [OK] Created: {output_file} ({len(entries)} slides)\n")
+    all_entries = _load_entries(Path(cfg['index_dir']), cfg['file_pattern'], cfg['pattern'])
+    output_dir = Path(cfg['output_dir'])
+
+    # Worker processes re-import reportlab, so only start them when books can
+    # actually render side by side
+    workers = min(len(all_entries), os.cpu_count() or 1)
+    if workers > 1:
+        with _process_pool(workers) as executor:
+            pending = _run_books(all_entries, output_dir, cfg['title_prefix'], executor)
+            click.echo()
+            _wait_for(pending)
+        click.echo()
+    else:
+        _run_books(all_entries, output_dir, cfg['title_prefix'])
 
     click.echo(f"All book PDFs generated in '{output_dir}' directory")
 
@@ -171,61 +383,20 @@ def master(
 ):
     """Generate master index PDF with all tags"""
 
-    # Load config if provided
-    if config:
-        with open(config, 'rb') as f:
-            config_data = tomllib.load(f)
-        index_dir = Path(config_data.get('index_dir', index_dir))
-        output_dir = Path(config_data.get('output_dir', output_dir))
-        pattern = config_data.get('pattern', pattern)
-        file_pattern = config_data.get('file_pattern', file_pattern)
-        title = config_data.get('master_title', title)
-        subtitle = config_data.get('master_subtitle', subtitle)
-
-    if not index_dir.exists():
-        click.echo(f"Error: Index directory '{index_dir}' does not exist.", err=True)
-        sys.exit(1)
-
-    # Find index files
-    index_files = sorted(index_dir.glob(file_pattern))
-
-    if not index_files:
-        click.echo(f"No index files found in {index_dir} matching '{file_pattern}'", err=True)
-        sys.exit(1)
-
-    click.echo(f"Found {len(index_files)} index file(s)\n")
-
-    # Parse all index files
-    click.echo("Parsing index files...")
-    all_entries = IndexParser.parse_multiple([str(f) for f in index_files], pattern)
-
-    click.echo(f"Parsed {sum(len(e) for e in all_entries.values())} total slides\n")
-
-    # Generate master index
-    click.echo("Generating master index PDF...")
-    output_dir.mkdir(parents=True, exist_ok=True)
-
-    generator = MasterIndexGenerator(
-        all_entries,
-        str(output_dir),
-        title=title,
-        subtitle=subtitle
+    # Config file values take precedence over command-line options
+    cfg = _apply(
+        _load_config(str(config)) if config else {},
+        index_dir=index_dir,
+        output_dir=output_dir,
+        pattern=pattern,
+        file_pattern=file_pattern,
+        master_title=title,
+        master_subtitle=subtitle
     )
 
-    # Show statistics
-    stats = generator.get_statistics()
-    click.echo(f"\nStatistics:")
-    click.echo(f"  Total Books: {stats['total_books']}")
-    click.echo(f"  Total Slides: {stats['total_slides']}")
-    click.echo(f"  Unique Tags: {stats['total_tags']}")
-
-    click.echo(f"\nTop {top_tags} Most Common Tags:")
-    for tag_info in stats['top_tags'][:top_tags]:
-        tag = tag_info['tag'][1:] if tag_info['tag'].startswith('#') else tag_info['tag']
-        click.echo(f"  {tag}: {tag_info['count']} occurrences across {tag_info['books']} book(s)")
-
-    output_file = generator.generate()
-    click.echo(f"\n[OK] Master index created: {output_file}")
+    all_entries = _load_entries(Path(cfg['index_dir']), cfg['file_pattern'], cfg['pattern'])
+    _run_master(all_entries, Path(cfg['output_dir']), cfg['master_title'],
+                cfg['master_subtitle'], top_tags)
 
 
 @main.command()
@@ -272,51 +443,18 @@ def compact(
 ):
     """Generate compact two-column index PDF"""
 
-    # Load config if provided
-    if config:
-        with open(config, 'rb') as f:
-            config_data = tomllib.load(f)
-        index_dir = Path(config_data.get('index_dir', index_dir))
-        output_dir = Path(config_data.get('output_dir', output_dir))
-        pattern = config_data.get('pattern', pattern)
-        file_pattern = config_data.get('file_pattern', file_pattern)
-        title = config_data.get('compact_title', title)
-
-    if not index_dir.exists():
-        click.echo(f"Error: Index directory '{index_dir}' does not exist.", err=True)
-        sys.exit(1)
-
-    # Find index files
-    index_files = sorted(index_dir.glob(file_pattern))
-
-    if not index_files:
-        click.echo(f"No index files found in {index_dir} matching '{file_pattern}'", err=True)
-        sys.exit(1)
-
-    click.echo(f"Found {len(index_files)} index file(s)\n")
-
-    # Parse all index files
-    click.echo("Parsing index files...")
-    all_entries = IndexParser.parse_multiple([str(f) for f in index_files], pattern)
-
-    click.echo(f"Parsed {sum(len(e) for e in all_entries.values())} total slides\n")
-
-    # Generate compact index
-    click.echo("Generating compact two-column index PDF...")
-    output_dir.mkdir(parents=True, exist_ok=True)
-
-    generator = CompactIndexGenerator(all_entries, str(output_dir), title=title)
-
-    # Show statistics
-    stats = generator.get_statistics()
-    click.echo(f"\nStatistics:")
-    click.echo(f"  Total Books: {stats['total_books']}")
-    click.echo(f"  Total Slides: {stats['total_slides']}")
-    click.echo(f"  Unique Tags: {stats['total_tags']}")
+    # Config file values take precedence over command-line options
+    cfg = _apply(
+        _load_config(str(config)) if config else {},
+        index_dir=index_dir,
+        output_dir=output_dir,
+        pattern=pattern,
+        file_pattern=file_pattern,
+        compact_title=title
+    )
 
-    output_file = generator.generate()
-    click.echo(f"\n[OK] Compact index created: {output_file}")
-    click.echo(f"Format: Two columns per page with B#:P# notation")
+    all_entries = _load_entries(Path(cfg['index_dir']), cfg['file_pattern'], cfg['pattern'])
+    _run_compact(all_entries, Path(cfg['output_dir']), cfg['compact_title'])
 
 
 @main.command()
@@ -337,39 +475,75 @@ def compact(
     type=click.Path(exists=True, dir_okay=False, path_type=Path),
     help='Path to config file (TOML format)'
 )
-def all(index_dir: Path, output_dir: Path, config: Optional[Path]):
+@click.option(
+    '-j', '--jobs',
+    type=click.IntRange(min=1),
+    default=None,
+    help='Number of worker processes for rendering PDFs (default: CPU count)'
+)
+def all(index_dir: Path, output_dir: Path, config: Optional[Path], jobs: Optional[int]):
     """Generate all PDFs (books, master index, and compact index)"""
 
-    click.echo("=" * 70)
-    click.echo("indxr - Generating All PDFs")
-    click.echo("=" * 70)
-    click.echo()
-
-    # Pass config to each subcommand
-    ctx = click.get_current_context()
+    cfg = _apply(
+        _load_config(str(config)) if config else {},
+        index_dir=index_dir,
+        output_dir=output_dir,
+        pattern=None,
+        file_pattern='Book * Index.md',
+        title_prefix=None,
+        master_title=None,
+        master_subtitle=None,
+        compact_title=None
+    )
+    output_dir = Path(cfg['output_dir'])
 
     click.echo("=" * 70)
-    click.echo("FEATURE 1: Generating Per-Book Content PDFs")
-    click.echo("=" * 70)
-    click.echo()
-    ctx.invoke(books, index_dir=index_dir, output_dir=output_dir, pattern=None,
-               file_pattern='Book * Index.md', title_prefix=None, config=config)
-
-    click.echo()
-    click.echo("=" * 70)
-    click.echo("FEATURE 2: Generating Master Index PDF")
+    click.echo("indxr - Generating All PDFs")
     click.echo("=" * 70)
     click.echo()
-    ctx.invoke(master, index_dir=index_dir, output_dir=output_dir, pattern=None,
-               file_pattern='Book * Index.md', title=None, subtitle=None, top_tags=10, config=config)
 
-    click.echo()
-    click.echo("=" * 70)
-    click.echo("FEATURE 3: Generating Compact Index PDF")
-    click.echo("=" * 70)
-    click.echo()
-    ctx.invoke(compact, index_dir=index_dir, output_dir=output_dir, pattern=None,
-               file_pattern='Book * Index.md', title=None, config=config)
+    # Parse once and share the entries across all three outputs
+    all_entries = _load_entries(Path(cfg['index_dir']), cfg['file_pattern'], cfg['pattern'])
+
+    # Books, master index and compact index are all independent renders, so
+    # queue them on one shared pool rather than running each feature in turn.
+    # With a single worker the pool would only add start-up cost.
+    workers = jobs or os.cpu_count() or 1
+    executor = _process_pool(workers) if workers > 1 else None
+    try:
+        click.echo()
+        click.echo("=" * 70)
+        click.echo("FEATURE 1: Generating Per-Book Content PDFs")
+        click.echo("=" * 70)
+        click.echo()
+        pending = _run_books(all_entries, output_dir, cfg['title_prefix'], executor)
+
+        click.echo()
+        click.echo("=" * 70)
+        click.echo("FEATURE 2: Generating Master Index PDF")
+        click.echo("=" * 70)
+        click.echo()
+        pending.update(_run_master(all_entries, output_dir, cfg['master_title'],
+                                   cfg['master_subtitle'], top_tags=10, executor=executor))
+
+        click.echo()
+        click.echo("=" * 70)
+        click.echo("FEATURE 3: Generating Compact Index PDF")
+        click.echo("=" * 70)
+        click.echo()
+        pending.update(_run_compact(all_entries, output_dir, cfg['compact_title'],
+                                    executor=executor))
+
+        if pending:
+            click.echo()
+            click.echo("=" * 70)
+            click.echo("Rendering PDFs")
+            click.echo("=" * 70)
+            click.echo()
+            _wait_for(pending)
+    finally:
+        if executor is not None:
+            executor.shutdown()
 
     click.echo()
     click.echo("=" * 70)
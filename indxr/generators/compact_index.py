@@ -12,10 +12,122 @@ from reportlab.lib import colors
 from reportlab.lib.enums import TA_CENTER
 from reportlab.platypus.doctemplate import BaseDocTemplate
 from pathlib import Path
-from typing import List, Dict
+from typing import Iterator, List, Dict, Set
 from collections import defaultdict
+from xml.sax.saxutils import escape
+from operator import attrgetter
 
-from ..parser import SlideEntry
+from ..parser import SlideEntry, count_slides, tag_statistics
+
+
+# Paragraph styles are immutable once built, so share them across generate() calls
+_STYLES = getSampleStyleSheet()
+
+_TITLE_STYLE = ParagraphStyle(
+    'CompactTitle',
+    parent=_STYLES['Heading1'],
+    fontSize=22,
+    textColor=colors.HexColor('#2C3E50'),
+    spaceAfter=15,
+    alignment=TA_CENTER
+)
+
+_SUBTITLE_STYLE = ParagraphStyle(
+    'CompactSubtitle',
+    parent=_STYLES['Normal'],
+    fontSize=11,
+    textColor=colors.HexColor('#7F8C8D'),
+    alignment=TA_CENTER,
+    spaceAfter=20
+)
+
+_STATS_STYLE = ParagraphStyle(
+    'CompactStats',
+    parent=_STYLES['Normal'],
+    fontSize=9,
+    textColor=colors.HexColor('#34495E'),
+    alignment=TA_CENTER,
+    spaceAfter=10,
+    leading=14
+)
+
+_FORMAT_STYLE = ParagraphStyle(
+    'FormatExplain',
+    parent=_STYLES['Normal'],
+    fontSize=8,
+    textColor=colors.HexColor('#95A5A6'),
+    alignment=TA_CENTER,
+    spaceAfter=20,
+    leading=11
+)
+
+_TAG_STYLE = ParagraphStyle(
+    'CompactTag',
+    parent=_STYLES['Normal'],
+    fontSize=9,
+    textColor=colors.HexColor('#2980B9'),
+    fontName='Helvetica-Bold',
+    spaceAfter=2,
+    spaceBefore=6,
+    leftIndent=0
+)
+
+_LOCATION_STYLE = ParagraphStyle(
+    'CompactLocation',
+    parent=_STYLES['Normal'],
+    fontSize=8,
+    textColor=colors.HexColor('#34495E'),
+    fontName='Helvetica',
+    spaceAfter=3,
+    leftIndent=10,
+    leading=10
+)
+
+
+def _add_page_number(canvas, doc):
+    """Add page number to the bottom center of each page"""
+    page_num = canvas.getPageNumber()
+    text = f"Page {page_num}"
+    canvas.saveState()
+    canvas.setFont('Helvetica', 9)
+    canvas.setFillColor(colors.HexColor('#7F8C8D'))
+    canvas.drawCentredString(letter[0] / 2, 0.5 * inch, text)
+    canvas.restoreState()
+
+
+# Page layout only depends on the page size, so it is built once as well.
+# Frames reset their layout state at the start of every page, which makes
+# the template safe to reuse across documents.
+_DOC_KWARGS = dict(
+    pagesize=letter,
+    rightMargin=0.5*inch,
+    leftMargin=0.5*inch,
+    topMargin=0.75*inch,
+    bottomMargin=0.5*inch
+)
+
+# Define two-column frame layout
+_FRAME_WIDTH = (letter[0] - 1.25*inch) / 2
+_FRAME_HEIGHT = letter[1] - 1.25*inch
+
+_TWO_COLUMN_TEMPLATE = PageTemplate(
+    id='TwoCol',
+    frames=[
+        Frame(
+            0.5*inch, 0.5*inch,
+            _FRAME_WIDTH, _FRAME_HEIGHT,
+            id='col1',
+            showBoundary=0
+        ),
+        Frame(
+            0.5*inch + _FRAME_WIDTH + 0.25*inch, 0.5*inch,
+            _FRAME_WIDTH, _FRAME_HEIGHT,
+            id='col2',
+            showBoundary=0
+        ),
+    ],
+    onPage=_add_page_number
+)
 
 
 class CompactIndexGenerator:
@@ -32,218 +144,115 @@ class CompactIndexGenerator:
 
         Args:
             all_entries: Dictionary of book_number -> list of SlideEntry
-            output_dir: Directory to save PDF
+            output_dir: Directory to save PDF (must already exist)
             title: Custom title (default: "Compact Index")
         """
         self.all_entries = all_entries
         self.output_dir = Path(output_dir)
-        self.output_dir.mkdir(parents=True, exist_ok=True)
         self.title = title or "Compact Index"
+        self.tag_books: Dict[str, Set[int]] = {}
         self.tag_index = self._build_tag_index()
 
     def _build_tag_index(self) -> Dict[str, List[SlideEntry]]:
         """Build a comprehensive tag index from all entries"""
         tag_map = defaultdict(list)
+        tag_books = defaultdict(set)
 
-        for book_num, entries in self.all_entries.items():
-            for entry in entries:
-                for tag in entry.tags:
-                    # Normalize tag to lowercase to collate #TOPIC and #topic together
-                    tag_map[tag.lower()].append(entry)
+        # Sort all entries once by book number, then page number, so every
+        # tag list below is built already in order
+        flat = [entry for entries in self.all_entries.values() for entry in entries]
+        flat.sort(key=attrgetter('book_number', 'page_sort_key'))
 
-        # Sort entries within each tag by book number, then page number
-        for tag in tag_map:
-            tag_map[tag].sort(key=lambda e: (e.book_number, self._parse_page_num(e.page_number)))
+        for entry in flat:
+            for tag in entry.tags:
+                # Normalize tag to lowercase to collate #TOPIC and #topic together
+                normalized_tag = tag.lower()
+                tag_map[normalized_tag].append(entry)
+                tag_books[normalized_tag].add(entry.book_number)
 
-        return dict(tag_map)
+        # Remember which books each tag appears in for get_statistics()
+        self.tag_books = dict(tag_books)
 
-    @staticmethod
-    def _parse_page_num(page_str: str) -> int:
-        """Parse page number string, handling ranges like '120-121'"""
-        if '-' in page_str:
-            return int(page_str.split('-')[0])
-        try:
-            return int(page_str)
-        except ValueError:
-            return 0
+        return dict(tag_map)
 
     def generate(self) -> str:
         """Generate the compact index PDF with two columns"""
         output_path = self.output_dir / "Compact_Index.pdf"
 
         # Create PDF document with two-column layout
-        doc = BaseDocTemplate(
-            str(output_path),
-            pagesize=letter,
-            rightMargin=0.5*inch,
-            leftMargin=0.5*inch,
-            topMargin=0.75*inch,
-            bottomMargin=0.5*inch
-        )
-
-        # Define two-column frame layout
-        frame_width = (letter[0] - 1.25*inch) / 2
-        frame_height = letter[1] - 1.25*inch
-
-        frame1 = Frame(
-            0.5*inch, 0.5*inch,
-            frame_width, frame_height,
-            id='col1',
-            showBoundary=0
-        )
-
-        frame2 = Frame(
-            0.5*inch + frame_width + 0.25*inch, 0.5*inch,
-            frame_width, frame_height,
-            id='col2',
-            showBoundary=0
-        )
+        doc = BaseDocTemplate(str(output_path), **_DOC_KWARGS)
+        doc.addPageTemplates([_TWO_COLUMN_TEMPLATE])
 
-        template = PageTemplate(id='TwoCol', frames=[frame1, frame2], onPage=self._add_page_number)
-        doc.addPageTemplates([template])
+        # BaseDocTemplate.build consumes and splits flowables in place, so it
+        # needs a real list; the story itself is produced lazily in one pass
+        doc.build(list(self._iter_story()))
 
-        story = []
-        styles = getSampleStyleSheet()
+        return str(output_path)
 
+    def _iter_story(self) -> Iterator:
+        """Yield every flowable of the compact index in document order"""
         # Title page
-        story.extend(self._create_title_page(styles))
+        yield from self._create_title_page()
 
         # Generate compact index entries (sorted alphabetically, case-insensitive)
         sorted_tags = sorted(self.tag_index.keys(), key=str.lower)
 
         for tag in sorted_tags:
-            entries = self.tag_index[tag]
-            story.extend(self._create_compact_tag_entry(tag, entries, styles))
-
-        # Build PDF
-        doc.build(story)
-
-        return str(output_path)
+            yield from self._create_compact_tag_entry(tag, self.tag_index[tag])
 
-    def _add_page_number(self, canvas, doc):
-        """Add page number to the bottom center of each page"""
-        page_num = canvas.getPageNumber()
-        text = f"Page {page_num}"
-        canvas.saveState()
-        canvas.setFont('Helvetica', 9)
-        canvas.setFillColor(colors.HexColor('#7F8C8D'))
-        canvas.drawCentredString(letter[0] / 2, 0.5 * inch, text)
-        canvas.restoreState()
-
-    def _create_title_page(self, styles) -> List:
+    def _create_title_page(self) -> List:
         """Create the title page"""
         elements = []
 
-        title_style = ParagraphStyle(
-            'CompactTitle',
-            parent=styles['Heading1'],
-            fontSize=22,
-            textColor=colors.HexColor('#2C3E50'),
-            spaceAfter=15,
-            alignment=TA_CENTER
-        )
-
-        title = Paragraph(self.title, title_style)
+        title = Paragraph(self.title, _TITLE_STYLE)
         elements.append(Spacer(1, 0.5*inch))
         elements.append(title)
         elements.append(Spacer(1, 0.2*inch))
 
-        subtitle_style = ParagraphStyle(
-            'CompactSubtitle',
-            parent=styles['Normal'],
-            fontSize=11,
-            textColor=colors.HexColor('#7F8C8D'),
-            alignment=TA_CENTER,
-            spaceAfter=20
-        )
-
-        subtitle = Paragraph("Quick Reference: Book &amp; Page Numbers Only", subtitle_style)
+        subtitle = Paragraph("Quick Reference: Book &amp; Page Numbers Only", _SUBTITLE_STYLE)
         elements.append(subtitle)
         elements.append(Spacer(1, 0.3*inch))
 
         # Statistics
-        total_slides = sum(len(entries) for entries in self.all_entries.values())
+        total_slides = count_slides(self.all_entries)
         total_books = len(self.all_entries)
         total_tags = len(self.tag_index)
 
-        stats_style = ParagraphStyle(
-            'CompactStats',
-            parent=styles['Normal'],
-            fontSize=9,
-            textColor=colors.HexColor('#34495E'),
-            alignment=TA_CENTER,
-            spaceAfter=10,
-            leading=14
-        )
-
         stats_text = f"""
         <b>{total_books}</b> Books | <b>{total_slides}</b> Slides | <b>{total_tags}</b> Topics
         """
 
-        stats = Paragraph(stats_text, stats_style)
+        stats = Paragraph(stats_text, _STATS_STYLE)
         elements.append(stats)
         elements.append(Spacer(1, 0.2*inch))
 
         # Format explanation
-        format_style = ParagraphStyle(
-            'FormatExplain',
-            parent=styles['Normal'],
-            fontSize=8,
-            textColor=colors.HexColor('#95A5A6'),
-            alignment=TA_CENTER,
-            spaceAfter=20,
-            leading=11
-        )
-
         format_text = """
         Format: <b>B#:P#</b> = Book Number : Page Number<br/>
         Example: <b>B1:42</b> = Book 1, Page 42
         """
 
-        format_explain = Paragraph(format_text, format_style)
+        format_explain = Paragraph(format_text, _FORMAT_STYLE)
         elements.append(format_explain)
         elements.append(PageBreak())
 
         return elements
 
-    def _create_compact_tag_entry(self, tag: str, entries: List[SlideEntry], styles) -> List:
+    def _create_compact_tag_entry(self, tag: str, entries: List[SlideEntry]) -> List:
         """Create a compact entry for a single tag"""
         elements = []
 
-        tag_style = ParagraphStyle(
-            'CompactTag',
-            parent=styles['Normal'],
-            fontSize=9,
-            textColor=colors.HexColor('#2980B9'),
-            fontName='Helvetica-Bold',
-            spaceAfter=2,
-            spaceBefore=6,
-            leftIndent=0
-        )
-
-        location_style = ParagraphStyle(
-            'CompactLocation',
-            parent=styles['Normal'],
-            fontSize=8,
-            textColor=colors.HexColor('#34495E'),
-            fontName='Helvetica',
-            spaceAfter=3,
-            leftIndent=10,
-            leading=10
-        )
-
-        # Remove the # from tag for display
-        tag_display = tag if not tag.startswith('#') else tag[1:]
+        # Remove the # from tag for display, escaping it for reportlab's markup parser
+        tag_display = escape(tag if not tag.startswith('#') else tag[1:])
 
         # Create compact location references: B1:6, B1:10, B2:15
-        locations = [f"B{entry.book_number}:{entry.page_number}" for entry in entries]
-        location_text = ", ".join(locations)
+        location_text = escape(", ".join([entry.location_str for entry in entries]))
 
         # Add tag heading
-        tag_para = Paragraph(f"<b>{tag_display}</b>", tag_style)
+        tag_para = Paragraph(f"<b>{tag_display}</b>", _TAG_STYLE)
 
         # Add locations
-        location_para = Paragraph(location_text, location_style)
+        location_para = Paragraph(location_text, _LOCATION_STYLE)
 
         # Keep tag and locations together
         tag_entry = KeepTogether([tag_para, location_para])
@@ -253,19 +262,4 @@ class CompactIndexGenerator:
 
     def get_statistics(self) -> Dict:
         """Get statistics about the index"""
-        total_slides = sum(len(entries) for entries in self.all_entries.values())
-
-        tag_stats = []
-        for tag, entries in sorted(self.tag_index.items(), key=lambda x: len(x[1]), reverse=True):
-            tag_stats.append({
-                'tag': tag,
-                'count': len(entries),
-                'books': len(set(e.book_number for e in entries))
-            })
-
-        return {
-            'total_books': len(self.all_entries),
-            'total_slides': total_slides,
-            'total_tags': len(self.tag_index),
-            'top_tags': tag_stats[:20]
-        }
+        return tag_statistics(self.all_entries, self.tag_index, self.tag_books)
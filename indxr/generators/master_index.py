@@ -7,15 +7,154 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.platypus import (
     SimpleDocTemplate, Paragraph, Spacer, PageBreak,
-    Table, TableStyle, KeepTogether
+    Flowable, KeepTogether
 )
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Set, Tuple
 from collections import defaultdict
+from functools import cached_property
+from operator import attrgetter
+from xml.sax.saxutils import escape
 
-from ..parser import SlideEntry
+from ..parser import SlideEntry, count_slides, tag_statistics
+
+
+# Paragraph styles are immutable once built, so share them across tag sections
+_STYLES = getSampleStyleSheet()
+
+_TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=_STYLES['Heading1'],
+    fontSize=28,
+    textColor=colors.HexColor('#2C3E50'),
+    spaceAfter=20,
+    alignment=TA_CENTER
+)
+
+_SUBTITLE_STYLE = ParagraphStyle(
+    'Subtitle',
+    parent=_STYLES['Normal'],
+    fontSize=14,
+    textColor=colors.HexColor('#7F8C8D'),
+    alignment=TA_CENTER,
+    spaceAfter=30
+)
+
+_STATS_STYLE = ParagraphStyle(
+    'Stats',
+    parent=_STYLES['Normal'],
+    fontSize=12,
+    textColor=colors.HexColor('#34495E'),
+    alignment=TA_CENTER,
+    spaceAfter=10,
+    leading=18
+)
+
+_TAG_STYLE = ParagraphStyle(
+    'TagHeading',
+    parent=_STYLES['Heading2'],
+    fontSize=14,
+    textColor=colors.HexColor('#2980B9'),
+    spaceAfter=10,
+    spaceBefore=15,
+    leftIndent=0,
+    fontName='Helvetica-Bold'
+)
+
+# Tag rows: a bold location column and a title column, with a light rule under each row
+_COL_WIDTHS = (1.5*inch, 5*inch)
+_ROW_FONT_SIZE = 9
+_ROW_LEADING = 12
+_ROW_PADDING = 4
+_CELL_PADDING = 6
+_LOCATION_FONT = 'Helvetica-Bold'
+_LOCATION_COLOR = colors.HexColor('#34495E')
+_TITLE_FONT = 'Helvetica'
+_TITLE_COLOR = colors.HexColor('#2C3E50')
+_RULE_COLOR = colors.HexColor('#E0E0E0')
+_RULE_WIDTH = 0.5
+
+# Sections longer than this are not kept together as a whole: only the heading and
+# its first _LEAD_ROWS rows are, and the remaining rows flow across pages
+_KEEP_TOGETHER_ROWS = 8
+_LEAD_ROWS = 2
+
+
+class _TagRows(Flowable):
+    """
+    The location/title rows of a tag section, drawn directly on the canvas
+
+    Looks the same as a two-column Table of plain strings, but every row has a
+    fixed layout, so wrapping and splitting are linear in the number of rows
+    instead of going through Table's general cell layout.
+    """
+
+    def __init__(self, rows: List[Tuple[str, str]]):
+        super().__init__()
+        self.rows = rows
+        self.hAlign = 'CENTER'
+        # Like Table, a newline in a cell starts another line within the row
+        self.row_heights = [
+            _ROW_LEADING * (max(location.count('\n'), title.count('\n')) + 1) + 2*_ROW_PADDING
+            for location, title in rows
+        ]
+
+    def wrap(self, availWidth, availHeight):
+        self.width = sum(_COL_WIDTHS)
+        self.height = sum(self.row_heights)
+        return self.width, self.height
+
+    def split(self, availWidth, availHeight):
+        used = 0
+        fits = 0
+        for row_height in self.row_heights:
+            if used + row_height > availHeight:
+                break
+            used += row_height
+            fits += 1
+
+        if fits == 0:
+            return []
+        if fits == len(self.rows):
+            return [self]
+        return [_TagRows(self.rows[:fits]), _TagRows(self.rows[fits:])]
+
+    def draw(self):
+        canv = self.canv
+        canv.saveState()
+
+        # One text object per column keeps font and colour changes to two per block
+        location_text = canv.beginText()
+        location_text.setFont(_LOCATION_FONT, _ROW_FONT_SIZE, _ROW_LEADING)
+        location_text.setFillColor(_LOCATION_COLOR)
+        title_text = canv.beginText()
+        title_text.setFont(_TITLE_FONT, _ROW_FONT_SIZE, _ROW_LEADING)
+        title_text.setFillColor(_TITLE_COLOR)
+
+        title_x = _COL_WIDTHS[0] + _CELL_PADDING
+        rules = []
+        top = self.height
+        for (location, title), row_height in zip(self.rows, self.row_heights):
+            baseline = top - _ROW_PADDING - _ROW_FONT_SIZE
+            location_text.setTextOrigin(_CELL_PADDING, baseline)
+            location_text.textLines(location.split('\n'))
+            title_text.setTextOrigin(title_x, baseline)
+            title_text.textLines(title.split('\n'))
+            top -= row_height
+            rules.append((0, top, self.width, top))
+
+        canv.drawText(location_text)
+        canv.drawText(title_text)
+
+        canv.setStrokeColor(_RULE_COLOR)
+        canv.setLineWidth(_RULE_WIDTH)
+        canv.setLineCap(1)
+        canv.setLineJoin(1)
+        canv.lines(rules)
+
+        canv.restoreState()
 
 
 class MasterIndexGenerator:
@@ -39,16 +178,27 @@ class MasterIndexGenerator:
         """
         self.all_entries = all_entries
         self.output_dir = Path(output_dir)
-        self.output_dir.mkdir(parents=True, exist_ok=True)
         self.title = title or "Master Index"
         self.subtitle = subtitle or "Comprehensive Topic Index Across All Books"
-        self.tag_index = self._build_tag_index()
+
+    @cached_property
+    def tag_index(self) -> Dict[str, List[SlideEntry]]:
+        """Tag -> sorted entries, built on first use"""
+        return self._build_tag_index()
+
+    @cached_property
+    def tag_books(self) -> Dict[str, Set[int]]:
+        """Tag -> book numbers it appears in, built on first use"""
+        return {
+            tag: {entry.book_number for entry in entries}
+            for tag, entries in self.tag_index.items()
+        }
 
     def _build_tag_index(self) -> Dict[str, List[SlideEntry]]:
         """Build a comprehensive tag index from all entries"""
         tag_map = defaultdict(list)
 
-        for book_num, entries in self.all_entries.items():
+        for entries in self.all_entries.values():
             for entry in entries:
                 for tag in entry.tags:
                     # Normalize tag to lowercase to collate #TOPIC and #topic together
@@ -56,22 +206,13 @@ class MasterIndexGenerator:
 
         # Sort entries within each tag by book number, then page number
         for tag in tag_map:
-            tag_map[tag].sort(key=lambda e: (e.book_number, self._parse_page_num(e.page_number)))
+            tag_map[tag].sort(key=attrgetter('book_number', 'page_sort_key'))
 
         return dict(tag_map)
 
-    @staticmethod
-    def _parse_page_num(page_str: str) -> int:
-        """Parse page number string, handling ranges like '120-121'"""
-        if '-' in page_str:
-            return int(page_str.split('-')[0])
-        try:
-            return int(page_str)
-        except ValueError:
-            return 0
-
     def generate(self) -> str:
         """Generate the master index PDF"""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
         output_path = self.output_dir / "Master_Index.pdf"
 
         doc = SimpleDocTemplate(
@@ -83,18 +224,17 @@ class MasterIndexGenerator:
             bottomMargin=0.75*inch
         )
 
-        story = []
-        styles = getSampleStyleSheet()
-
         # Title page
-        story.extend(self._create_title_page(styles))
+        story = self._create_title_page()
 
         # Generate index entries for each tag (sorted alphabetically, case-insensitive)
         sorted_tags = sorted(self.tag_index.keys(), key=str.lower)
 
-        for tag in sorted_tags:
-            entries = self.tag_index[tag]
-            story.extend(self._create_tag_section(tag, entries, styles))
+        story.extend([
+            flowable
+            for tag in sorted_tags
+            for flowable in self._create_tag_section(tag, self.tag_index[tag])
+        ])
 
         # Build PDF with page numbers
         doc.build(story, onFirstPage=self._add_page_number, onLaterPages=self._add_page_number)
@@ -111,130 +251,69 @@ class MasterIndexGenerator:
         canvas.drawCentredString(letter[0] / 2, 0.5 * inch, text)
         canvas.restoreState()
 
-    def _create_title_page(self, styles) -> List:
+    def _create_title_page(self) -> List:
         """Create the title page"""
         elements = []
 
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=28,
-            textColor=colors.HexColor('#2C3E50'),
-            spaceAfter=20,
-            alignment=TA_CENTER
-        )
-
-        title = Paragraph(self.title, title_style)
+        title = Paragraph(self.title, _TITLE_STYLE)
         elements.append(Spacer(1, 1.5*inch))
         elements.append(title)
         elements.append(Spacer(1, 0.3*inch))
 
-        subtitle_style = ParagraphStyle(
-            'Subtitle',
-            parent=styles['Normal'],
-            fontSize=14,
-            textColor=colors.HexColor('#7F8C8D'),
-            alignment=TA_CENTER,
-            spaceAfter=30
-        )
-
-        subtitle = Paragraph(self.subtitle, subtitle_style)
+        subtitle = Paragraph(self.subtitle, _SUBTITLE_STYLE)
         elements.append(subtitle)
         elements.append(Spacer(1, 0.5*inch))
 
         # Statistics
-        total_slides = sum(len(entries) for entries in self.all_entries.values())
+        total_slides = count_slides(self.all_entries)
         total_books = len(self.all_entries)
         total_tags = len(self.tag_index)
 
-        stats_style = ParagraphStyle(
-            'Stats',
-            parent=styles['Normal'],
-            fontSize=12,
-            textColor=colors.HexColor('#34495E'),
-            alignment=TA_CENTER,
-            spaceAfter=10,
-            leading=18
-        )
-
         stats_text = f"""
         <b>Total Books:</b> {total_books}<br/>
         <b>Total Slides:</b> {total_slides}<br/>
         <b>Total Unique Tags:</b> {total_tags}
         """
 
-        stats = Paragraph(stats_text, stats_style)
+        stats = Paragraph(stats_text, _STATS_STYLE)
         elements.append(stats)
         elements.append(PageBreak())
 
         return elements
 
-    def _create_tag_section(self, tag: str, entries: List[SlideEntry], styles) -> List:
+    def _create_tag_section(self, tag: str, entries: List[SlideEntry]) -> List:
         """Create a section for a single tag with all its occurrences"""
-        elements = []
+        if not entries:
+            return []
 
-        tag_style = ParagraphStyle(
-            'TagHeading',
-            parent=styles['Heading2'],
-            fontSize=14,
-            textColor=colors.HexColor('#2980B9'),
-            spaceAfter=10,
-            spaceBefore=15,
-            leftIndent=0,
-            fontName='Helvetica-Bold'
-        )
+        elements = []
 
-        tag_display = tag if not tag.startswith('#') else tag[1:]
         tag_heading = Paragraph(
-            f"<b>{tag}</b>  <font size=10 color='#95A5A6'>({len(entries)} occurrence{'s' if len(entries) != 1 else ''})</font>",
-            tag_style
+            f"<b>{escape(tag)}</b>  <font size=10 color='#95A5A6'>({len(entries)} occurrence{'s' if len(entries) != 1 else ''})</font>",
+            _TAG_STYLE
         )
 
         # Create table for entries
-        table_data = []
-        for entry in entries:
-            location = f"Book {entry.book_number}, Page {entry.page_number}"
-            table_data.append([location, entry.slide_title])
-
-        col_widths = [1.5*inch, 5*inch]
-        table = Table(table_data, colWidths=col_widths)
-
-        table.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-            ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 9),
-            ('LEFTPADDING', (0, 0), (-1, -1), 6),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 6),
-            ('TOPPADDING', (0, 0), (-1, -1), 4),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-            ('LINEBELOW', (0, 0), (-1, -1), 0.5, colors.HexColor('#E0E0E0')),
-            ('TEXTCOLOR', (0, 0), (0, -1), colors.HexColor('#34495E')),
-            ('TEXTCOLOR', (1, 0), (1, -1), colors.HexColor('#2C3E50')),
-        ]))
-
-        tag_section = KeepTogether([tag_heading, table, Spacer(1, 0.15*inch)])
-        elements.append(tag_section)
+        table_data = [
+            (f"Book {entry.book_number}, Page {entry.page_number}", entry.slide_title)
+            for entry in entries
+        ]
+
+        if len(table_data) <= _KEEP_TOGETHER_ROWS:
+            tag_section = KeepTogether([tag_heading, _TagRows(table_data), Spacer(1, 0.15*inch)])
+            elements.append(tag_section)
+        else:
+            # Avoid trial-laying out the whole section; just keep the heading off the page bottom
+            elements.append(KeepTogether([tag_heading, _TagRows(table_data[:_LEAD_ROWS])]))
+            elements.append(_TagRows(table_data[_LEAD_ROWS:]))
+            elements.append(Spacer(1, 0.15*inch))
 
         return elements
 
     def get_statistics(self) -> Dict:
-        """Get statistics about the index"""
-        total_slides = sum(len(entries) for entries in self.all_entries.values())
+        """Get statistics about the index (computed once; treat the result as read-only)"""
+        return self._statistics
 
-        tag_stats = []
-        for tag, entries in sorted(self.tag_index.items(), key=lambda x: len(x[1]), reverse=True):
-            tag_stats.append({
-                'tag': tag,
-                'count': len(entries),
-                'books': len(set(e.book_number for e in entries))
-            })
-
-        return {
-            'total_books': len(self.all_entries),
-            'total_slides': total_slides,
-            'total_tags': len(self.tag_index),
-            'top_tags': tag_stats[:20]
-        }
+    @cached_property
+    def _statistics(self) -> Dict:
+        return tag_statistics(self.all_entries, self.tag_index, self.tag_books)
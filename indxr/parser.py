@@ -2,32 +2,156 @@
 Index file parser for extracting structured slide data
 """
 
+import functools
+import heapq
+import mmap
+import multiprocessing as mp
+import os
 import re
+import sys
+from bisect import bisect_right
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import List, Dict
+from operator import itemgetter
+from typing import Iterable, List, Dict, Optional, Set, Tuple, Union
 from pathlib import Path
 
 
-@dataclass
+def _parse_page_start(page_str: str) -> Optional[int]:
+    """Parse the first page of a page number string like '120-121', or None if not numeric"""
+    try:
+        return int(page_str.split('-')[0])
+    except ValueError:
+        return None
+
+
+def _decode_groups(groups: Tuple[bytes, ...], translate_newlines: bool) -> Tuple[str, ...]:
+    """
+    Decode the ASCII groups of a bytes-pattern match
+
+    With translate_newlines, CR LF and lone CR become LF, as on the decoded str
+    path. The default pattern matches the same entries either way, so
+    translating the captured groups equals translating the whole file first.
+    """
+    if translate_newlines:
+        return tuple(
+            group.replace(b'\r\n', b'\n').replace(b'\r', b'\n').decode('ascii')
+            for group in groups
+        )
+    return tuple(group.decode('ascii') for group in groups)
+
+
+@dataclass(frozen=True)
 class SlideEntry:
     """Represents a single slide entry from an index file"""
+    # Slots keep per-entry memory down on large indexes. Entries are frozen,
+    # and therefore hashable, once parsed. (dataclass(slots=True) would do the
+    # same but needs Python 3.10.)
+    __slots__ = (
+        'book_number', 'page_number', 'slide_title', 'tags',
+        'page_start', 'page_sort_key', 'location_str'
+    )
+
     book_number: int
     page_number: str
     slide_title: str
-    tags: List[str]
+    tags: Tuple[str, ...]
+
+    def __post_init__(self):
+        # Frozen instances must bypass the generated __setattr__
+        object.__setattr__(self, 'tags', tuple(self.tags))
+        # Numeric start page (None when the page is not numeric, e.g. 'iv'),
+        # and a sort key that places non-numeric pages first
+        page_start = _parse_page_start(self.page_number)
+        object.__setattr__(self, 'page_start', page_start)
+        object.__setattr__(self, 'page_sort_key', page_start if page_start is not None else 0)
+        # Compact B#:P# reference, precomputed once for rendering
+        object.__setattr__(self, 'location_str', f"B{self.book_number}:{self.page_number}")
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        # Pickle would otherwise restore slots through the frozen __setattr__
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
 
     def __repr__(self):
         tags_str = " ".join(self.tags)
         return f"Book {self.book_number}, Page {self.page_number}, Slide: \"{self.slide_title}\" {tags_str}"
 
 
+# Below this combined input size, starting parser processes costs more than it
+# saves: the parent still unpickles every entry, at about half the cost of parsing
+_PARALLEL_PARSE_MIN_BYTES = 32 * 1024 * 1024
+
+# Largest combined input scanned as a single joined buffer
+_JOINED_SCAN_MAX_BYTES = 1024 * 1024
+
+# Separates files in a joined scan. No default-pattern match can span it: a quote
+# with NUL on either side can neither open nor close a slide title.
+_JOIN_SEPARATOR = b'\x00"\x00'
+
+
+class ParsedIndex(dict):
+    """Mapping of book_number -> list of SlideEntry, with the total slide count"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.total_slides = sum(len(entries) for entries in self.values())
+
+
+def count_slides(all_entries: Dict[int, List[SlideEntry]]) -> int:
+    """Return the total number of slides, reusing a ParsedIndex's precomputed count"""
+    if isinstance(all_entries, ParsedIndex):
+        return all_entries.total_slides
+    return sum(len(entries) for entries in all_entries.values())
+
+
+def tag_statistics(
+    all_entries: Dict[int, List[SlideEntry]],
+    tag_index: Dict[str, List[SlideEntry]],
+    tag_books: Dict[str, Set[int]],
+    top_n: int = 20
+) -> Dict:
+    """
+    Summarise a tag index for the generators' get_statistics()
+
+    Only the top_n most frequent tags are reported, so they are selected with
+    heapq.nlargest rather than by sorting every tag. Ties keep tag_index order.
+    """
+    counts = [(tag, len(entries)) for tag, entries in tag_index.items()]
+
+    top_tags = []
+    for tag, count in heapq.nlargest(top_n, counts, key=itemgetter(1)):
+        top_tags.append({
+            'tag': tag,
+            'count': count,
+            'books': len(tag_books[tag])
+        })
+
+    return {
+        'total_books': len(all_entries),
+        'total_slides': count_slides(all_entries),
+        'total_tags': len(tag_index),
+        'top_tags': top_tags
+    }
+
+
 class IndexParser:
     """Parses index files with configurable patterns"""
 
     # Default pattern: Book 1, Page 6, Slide: "Title" #tag1 #tag2
     DEFAULT_PATTERN = r'Book\s+(\d+),\s+Page\s+(\d+(?:-\d+)?),\s+Slide:\s+"([^"]+)"\s+(#[\w\-]+(?:\s+#[\w\-]+)*)'
 
-    def __init__(self, index_file_path: str, pattern: str = None):
+    # Compiled once at class load and shared by every parser
+    _COMPILED_DEFAULT = re.compile(DEFAULT_PATTERN)
+    _COMPILED_DEFAULT_BYTES = re.compile(DEFAULT_PATTERN.encode('ascii'))
+    _NON_ASCII_RE = re.compile(rb'[^\x00-\x7f]')
+    _TAG_RE = re.compile(r'#[\w\-]+')
+
+    def __init__(self, index_file_path: Union[str, os.PathLike], pattern: str = None):
         """
         Initialize parser
 
@@ -37,6 +161,7 @@ class IndexParser:
         """
         self.index_file_path = Path(index_file_path)
         self.pattern = pattern or self.DEFAULT_PATTERN
+        self._regex = re.compile(pattern) if pattern else IndexParser._COMPILED_DEFAULT
         self.entries: List[SlideEntry] = []
 
         if not self.index_file_path.exists():
@@ -45,22 +170,42 @@ class IndexParser:
     def parse(self) -> List[SlideEntry]:
         """Parse the index file and return list of SlideEntry objects"""
         try:
-            with open(self.index_file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            matches = self._scan()
         except Exception as e:
             raise IOError(f"Error reading {self.index_file_path}: {e}")
 
-        matches = re.finditer(self.pattern, content)
+        self.entries.extend(
+            IndexParser._build_entries(matches, self._regex is IndexParser._COMPILED_DEFAULT)
+        )
+
+        return self.entries
+
+    @staticmethod
+    def _build_entries(matches: Iterable[tuple], split_tags: bool) -> List[SlideEntry]:
+        """
+        Turn match groups into SlideEntry objects, skipping malformed entries
 
-        for match in matches:
+        split_tags is true for the default pattern, whose tag group only holds
+        whitespace-separated #tags.
+        """
+        entries = []
+        for groups in matches:
             try:
-                book_num = int(match.group(1))
-                page_num = match.group(2)  # Keep as string to handle ranges like "120-121"
-                slide_title = match.group(3)
-                tags_str = match.group(4)
+                book_num = int(groups[0])
+                page_num = groups[1]  # Keep as string to handle ranges like "120-121"
+                slide_title = groups[2]
+                tags_str = groups[3]
 
-                # Extract individual tags
-                tags = re.findall(r'#[\w\-]+', tags_str)
+                # Extract individual tags. The default pattern only captures
+                # whitespace-separated #tags, so a plain split is enough; custom
+                # patterns may capture other text and still need the tag regex.
+                if split_tags:
+                    tags = tags_str.split()
+                else:
+                    tags = IndexParser._TAG_RE.findall(tags_str)
+                # The same few tags recur on thousands of slides; interning keeps
+                # one copy of each and makes later dict/set lookups cheaper
+                tags = tuple(map(sys.intern, tags))
 
                 entry = SlideEntry(
                     book_number=book_num,
@@ -68,42 +213,158 @@ class IndexParser:
                     slide_title=slide_title,
                     tags=tags
                 )
-                self.entries.append(entry)
+                entries.append(entry)
             except (IndexError, ValueError) as e:
                 # Skip malformed entries but continue parsing
                 continue
 
-        return self.entries
+        return entries
+
+    def _scan(self) -> List[tuple]:
+        """
+        Run the entry pattern over the file and return each match's groups
+
+        The file is memory-mapped rather than read into a str. When the
+        default pattern is used and the file is pure ASCII, the bytes form of
+        the pattern runs directly over the mapping and only the captured
+        groups are decoded, with newlines translated as on the str path.
+        Otherwise the file is decoded as UTF-8 first, since bytes patterns
+        only treat ASCII characters as word characters.
+        """
+        with open(self.index_file_path, 'rb') as f:
+            # mmap cannot map an empty file
+            if os.fstat(f.fileno()).st_size == 0:
+                return []
+
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if (
+                    self._regex is IndexParser._COMPILED_DEFAULT
+                    and IndexParser._NON_ASCII_RE.search(mm) is None
+                ):
+                    translate_newlines = mm.find(b'\r') != -1
+                    return [
+                        _decode_groups(match.groups(), translate_newlines)
+                        for match in IndexParser._COMPILED_DEFAULT_BYTES.finditer(mm)
+                    ]
+                content = mm[:].decode('utf-8')
+
+        # Match text-mode reading, which translates Windows/old Mac newlines
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+        return [match.groups() for match in self._regex.finditer(content)]
+
+    @staticmethod
+    def _scan_joined(paths: List[Union[str, os.PathLike]]) -> List[Optional[List[tuple]]]:
+        """
+        Scan many small default-pattern files with a single regex pass
+
+        The files are read and joined with _JOIN_SEPARATOR, and the bytes
+        pattern runs once over the result. Each match is assigned back to its
+        file by offset. The returned list has one entry per path: the match
+        groups, or None for a file that must be parsed on its own because it
+        could not be read or is not pure ASCII.
+        """
+        results: List[Optional[List[tuple]]] = [None] * len(paths)
+        buffers = []
+        starts = []
+        owners = []
+        offset = 0
+        translate_newlines = False
+        for i, path in enumerate(paths):
+            try:
+                with open(path, 'rb') as f:
+                    data = f.read()
+            except OSError:
+                # The per-file parse reports the error
+                continue
+            if IndexParser._NON_ASCII_RE.search(data) is not None:
+                continue
+
+            results[i] = []
+            translate_newlines = translate_newlines or b'\r' in data
+            buffers.append(data)
+            starts.append(offset)
+            owners.append(i)
+            offset += len(data) + len(_JOIN_SEPARATOR)
+
+        joined = _JOIN_SEPARATOR.join(buffers)
+        for match in IndexParser._COMPILED_DEFAULT_BYTES.finditer(joined):
+            owner = owners[bisect_right(starts, match.start()) - 1]
+            results[owner].append(_decode_groups(match.groups(), translate_newlines))
+
+        return results
 
     @staticmethod
-    def parse_multiple(index_file_paths: List[str], pattern: str = None) -> Dict[int, List[SlideEntry]]:
+    def parse_multiple(
+        index_file_paths: Iterable[Union[str, os.PathLike]],
+        pattern: str = None,
+        max_workers: int = 1
+    ) -> ParsedIndex:
         """
         Parse multiple index files and return a dictionary keyed by book number
 
+        With max_workers above 1, files are parsed in spawned worker processes
+        when there is more than one and their combined size makes the start-up
+        cost worthwhile. Spawning re-imports the caller's main module, so it
+        must be guarded by `if __name__ == '__main__':`. Small sets of files
+        using the default pattern are scanned in a single pass over their
+        joined contents instead.
+
         Args:
-            index_file_paths: List of paths to index files
+            index_file_paths: Paths to index files (str or path-like)
             pattern: Optional regex pattern override
+            max_workers: Maximum parser processes (default: 1, parse in this process)
 
         Returns:
-            Dictionary mapping book_number -> list of SlideEntry objects
+            ParsedIndex mapping book_number -> list of SlideEntry objects
         """
-        all_entries = {}
+        all_entries = defaultdict(list)
 
-        for file_path in index_file_paths:
+        paths = list(index_file_paths)
+        total_size = 0
+        for file_path in paths:
             try:
-                parser = IndexParser(file_path, pattern)
-                entries = parser.parse()
-
-                # Group by book number
-                for entry in entries:
-                    if entry.book_number not in all_entries:
-                        all_entries[entry.book_number] = []
-                    all_entries[entry.book_number].append(entry)
-            except (FileNotFoundError, IOError) as e:
-                print(f"Warning: Skipping {file_path}: {e}")
+                total_size += os.stat(file_path).st_size
+            except OSError:
+                # Reported below when the file fails to parse
                 continue
 
-        return all_entries
+        executor = None
+        if max_workers > 1 and len(paths) > 1 and total_size >= _PARALLEL_PARSE_MIN_BYTES:
+            executor = ProcessPoolExecutor(
+                max_workers=min(max_workers, len(paths)),
+                mp_context=mp.get_context('spawn')
+            )
+
+        try:
+            # Results are consumed in input order so grouping is deterministic
+            if executor is not None:
+                pending = [executor.submit(_parse_one, path, pattern).result for path in paths]
+            else:
+                if not pattern and len(paths) > 1 and total_size <= _JOINED_SCAN_MAX_BYTES:
+                    scanned = IndexParser._scan_joined(paths)
+                else:
+                    scanned = [None] * len(paths)
+                pending = [
+                    functools.partial(_parse_one, path, pattern) if matches is None
+                    else functools.partial(IndexParser._build_entries, matches, True)
+                    for path, matches in zip(paths, scanned)
+                ]
+
+            for file_path, get_entries in zip(paths, pending):
+                try:
+                    entries = get_entries()
+
+                    # Group by book number
+                    for entry in entries:
+                        all_entries[entry.book_number].append(entry)
+                except (FileNotFoundError, IOError) as e:
+                    print(f"Warning: Skipping {file_path}: {e}")
+                    continue
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        return ParsedIndex(all_entries)
 
     @staticmethod
     def get_all_tags(entries: List[SlideEntry]) -> Dict[str, List[SlideEntry]]:
@@ -116,14 +377,16 @@ class IndexParser:
         Returns:
             Dictionary mapping tag -> list of SlideEntry objects that contain that tag
         """
-        tag_map = {}
+        tag_map = defaultdict(list)
 
         for entry in entries:
             for tag in entry.tags:
                 # Normalize tag to lowercase to collate #TOPIC and #topic together
-                normalized_tag = tag.lower()
-                if normalized_tag not in tag_map:
-                    tag_map[normalized_tag] = []
-                tag_map[normalized_tag].append(entry)
+                tag_map[tag.lower()].append(entry)
+
+        return dict(tag_map)
+
 
-        return tag_map
+def _parse_one(index_file_path: Union[str, os.PathLike], pattern: Optional[str]) -> List[SlideEntry]:
+    """Parse a single index file (module-level so worker processes can run it)"""
+    return IndexParser(index_file_path, pattern).parse()
@@ -0,0 +1,22 @@
+"""
+Tests for the per-book PDF generator
+"""
+
+import pytest
+
+from indxr.generators.book_pdfs import BookPDFGenerator
+from indxr.parser import SlideEntry
+
+
+@pytest.mark.parametrize('pages, expected', [
+    (['5', '9', '120-121'], '5-120'),
+    (['iv', '5', '9'], '5-9'),
+    (['iv', 'x'], 'N/A'),
+    ([], 'N/A'),
+])
+def test_page_range_ignores_non_numeric_pages(tmp_path, pages, expected):
+    entries = [SlideEntry(1, page, f"Slide {page}", ['#tag']) for page in pages]
+
+    generator = BookPDFGenerator(1, entries, output_dir=str(tmp_path))
+
+    assert generator._get_page_range() == expected
@@ -0,0 +1,28 @@
+"""
+Tests for CLI helpers
+"""
+
+import ntpath
+import os
+
+from indxr.cli import _shallow_glob
+
+
+def _make_files(directory, names):
+    for name in names:
+        (directory / name).write_text('')
+
+
+def test_shallow_glob_matches_path_glob(tmp_path):
+    _make_files(tmp_path, ['Book 2 Index.md', 'Book 10 Index.md', 'book 1 index.md', 'Notes.md'])
+
+    assert _shallow_glob(tmp_path, 'Book * Index.md') == sorted(tmp_path.glob('Book * Index.md'))
+
+
+def test_shallow_glob_ignores_case_where_the_platform_does(tmp_path, monkeypatch):
+    _make_files(tmp_path, ['Book 2 Index.md', 'book 1 index.md', 'Book 3 Index.MD', 'Notes.md'])
+    monkeypatch.setattr(os.path, 'normcase', ntpath.normcase)
+
+    names = [path.name for path in _shallow_glob(tmp_path, 'Book * Index.md')]
+
+    assert names == ['book 1 index.md', 'Book 2 Index.md', 'Book 3 Index.MD']
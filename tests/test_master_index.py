@@ -0,0 +1,66 @@
+"""
+Tests for the master index generator
+"""
+
+from reportlab.platypus import Table, TableStyle
+
+from indxr.generators.master_index import _COL_WIDTHS, _TagRows
+
+ROWS = [
+    ("Book 1, Page 1", "Single line"),
+    ("Book 1, Page 2", "Two\nlines"),
+    ("Book 2, Page 3", "Three\nline\ntitle"),
+    ("Book 2,\nPage 4", "Location wraps"),
+]
+
+# Row heights: 12pt leading per line plus 4pt padding above and below
+ROW_HEIGHTS = [20, 32, 44, 32]
+
+
+def _table_row_heights(rows):
+    """Row heights reportlab's Table gives the same cells with the old row style"""
+    table = Table(rows, colWidths=_COL_WIDTHS, style=TableStyle([
+        ('FONTSIZE', (0, 0), (-1, -1), 9),
+        ('TOPPADDING', (0, 0), (-1, -1), 4),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+    ]))
+    table.wrap(sum(_COL_WIDTHS), 10000)
+    return table._rowHeights
+
+
+def test_wrap_counts_every_line_of_multi_line_cells():
+    flowable = _TagRows(ROWS)
+
+    width, height = flowable.wrap(500, 10000)
+
+    assert flowable.row_heights == ROW_HEIGHTS
+    assert (width, height) == (sum(_COL_WIDTHS), sum(ROW_HEIGHTS))
+
+
+def test_row_heights_match_table():
+    assert _TagRows(ROWS).row_heights == _table_row_heights(ROWS)
+
+
+def test_split_at_exact_row_boundary():
+    flowable = _TagRows(ROWS)
+    flowable.wrap(500, 10000)
+
+    first, rest = flowable.split(500, ROW_HEIGHTS[0] + ROW_HEIGHTS[1])
+
+    assert first.rows == ROWS[:2]
+    assert rest.rows == ROWS[2:]
+    assert first.wrap(500, 10000)[1] == ROW_HEIGHTS[0] + ROW_HEIGHTS[1]
+
+
+def test_split_returns_nothing_when_no_row_fits():
+    flowable = _TagRows(ROWS)
+    flowable.wrap(500, 10000)
+
+    assert flowable.split(500, ROW_HEIGHTS[0] - 0.5) == []
+
+
+def test_split_returns_self_when_everything_fits():
+    flowable = _TagRows(ROWS)
+    flowable.wrap(500, 10000)
+
+    assert flowable.split(500, sum(ROW_HEIGHTS)) == [flowable]
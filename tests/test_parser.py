@@ -0,0 +1,116 @@
+"""
+Tests for the index parser
+"""
+
+import dataclasses
+import pickle
+import re
+from collections import defaultdict
+
+import pytest
+
+from indxr.parser import IndexParser, ParsedIndex, SlideEntry, _parse_one
+
+
+def _text_mode_groups(path):
+    """Reference scan: decode, translate newlines and run the str pattern"""
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    return [match.groups() for match in re.finditer(IndexParser.DEFAULT_PATTERN, content)]
+
+
+def _by_book(entries):
+    grouped = defaultdict(list)
+    for entry in entries:
+        grouped[entry.book_number].append(
+            (entry.page_number, entry.slide_title, entry.tags)
+        )
+    return dict(grouped)
+
+
+@pytest.fixture
+def index_files(tmp_path):
+    contents = {
+        'lf.md': b'Book 1, Page 1, Slide: "A" #x #y\nBook 1, Page 2, Slide: "Unclosed',
+        # A title left open in the previous file must not pick up this quote
+        'crlf.md': b'" #z\r\nBook 2, Page 3, Slide: "Two\r\nLines" #q\r\n',
+        'cr.md': b'Book 2, Page 4, Slide: "Old\rMac" #m\r',
+        'empty.md': b'',
+        'utf8.md': b'Book 3, Page 5-6, Slide: "Caf\xc3\xa9\r\nMenu" #caf\xc3\xa9 #menu\r\n',
+        'tail.md': b'Book 4, Page 7, Slide: ',
+        'head.md': b'"E" #e\nBook 4, Page 8, Slide: "E2"\n #e2 #e3\n',
+    }
+    paths = []
+    for name, data in contents.items():
+        path = tmp_path / name
+        path.write_bytes(data)
+        paths.append(path)
+    return paths
+
+
+def test_joined_scan_matches_per_file_parse(index_files, tmp_path, capsys):
+    paths = index_files + [tmp_path / 'missing.md']
+
+    parsed = IndexParser.parse_multiple(paths)
+
+    expected = []
+    for path in index_files:
+        expected.extend(_parse_one(path, None))
+    assert _by_book(entry for entries in parsed.values() for entry in entries) == _by_book(expected)
+    assert 'Skipping' in capsys.readouterr().out
+
+
+def test_joined_scan_leaves_unreadable_and_non_ascii_files_to_per_file_parse(index_files, tmp_path):
+    paths = index_files + [tmp_path / 'missing.md']
+
+    scanned = IndexParser._scan_joined(paths)
+
+    names = [path.name for path in paths]
+    assert scanned[names.index('utf8.md')] is None
+    assert scanned[names.index('missing.md')] is None
+    assert scanned[names.index('empty.md')] == []
+    assert scanned[names.index('crlf.md')] == [('2', '3', 'Two\nLines', '#q')]
+
+
+def test_joined_scan_matches_text_mode_reading(index_files):
+    parsed = IndexParser.parse_multiple(index_files)
+
+    expected = IndexParser._build_entries(
+        [groups for path in index_files for groups in _text_mode_groups(path)],
+        split_tags=True
+    )
+    assert _by_book(entry for entries in parsed.values() for entry in entries) == _by_book(expected)
+
+    titles = [entry.slide_title for entries in parsed.values() for entry in entries]
+    assert 'Two\nLines' in titles
+    assert 'Old\nMac' in titles
+    assert 'Café\nMenu' in titles
+    assert 'Unclosed' not in ''.join(titles)
+
+
+@pytest.mark.parametrize('entry', [
+    SlideEntry(2, '120-121', 'Range', ['#net', '#tcp']),
+    SlideEntry(3, 'iv', 'Roman numeral', ['#intro']),
+])
+def test_slide_entry_pickle_round_trip(entry):
+    restored = pickle.loads(pickle.dumps(entry))
+
+    assert restored == entry
+    assert hash(restored) == hash(entry)
+    for name in ('page_start', 'page_sort_key', 'location_str'):
+        assert getattr(restored, name) == getattr(entry, name)
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        restored.slide_title = 'changed'
+
+
+def test_parsed_index_pickle_keeps_total_slides():
+    parsed = ParsedIndex({
+        1: [SlideEntry(1, '1', 'One', ['#a']), SlideEntry(1, '2', 'Two', ['#b'])],
+        2: [SlideEntry(2, '3', 'Three', ['#a'])],
+    })
+
+    restored = pickle.loads(pickle.dumps(parsed))
+
+    assert isinstance(restored, ParsedIndex)
+    assert restored == parsed
+    assert restored.total_slides == 3